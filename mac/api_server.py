@@ -18,6 +18,8 @@ import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+from message_queue import update_messages
+
 # Import play history
 try:
     from play_history import get_history
@@ -270,19 +272,7 @@ def get_play_history() -> dict:
 
 def save_message(message: str, ip: str):
     """Save a listener message to the queue."""
-    MESSAGES_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-    with _messages_lock:
-        # Load existing messages
-        messages = []
-        if MESSAGES_FILE.exists():
-            try:
-                with open(MESSAGES_FILE) as f:
-                    messages = json.load(f)
-            except Exception:
-                messages = []
-
-        # Add new message
+    with _messages_lock, update_messages(MESSAGES_FILE) as messages:
         messages.append({
             "message": message,
             "ip": ip,
@@ -291,11 +281,7 @@ def save_message(message: str, ip: str):
         })
 
         # Keep only last 100 messages
-        messages = messages[-100:]
-
-        # Save
-        with open(MESSAGES_FILE, "w") as f:
-            json.dump(messages, f, indent=2)
+        del messages[:-100]
 
 
 def get_diary(limit: int | None = None) -> dict:
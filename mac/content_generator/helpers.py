@@ -5,82 +5,281 @@ Shared helpers for WRIT-FM content generators.
 
 from __future__ import annotations
 
+import functools
+import json
 import os
+import random
 import re
 import shutil
 import subprocess
+import sys
+import threading
 import time
 import urllib.parse
 import urllib.request
+import wave
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
 DEFAULT_NEWS_FEEDS = (
     "https://feeds.bbci.co.uk/news/rss.xml",
     "https://feeds.npr.org/1001/rss.xml",
 )
 NEWS_CACHE_TTL_SECONDS = int(os.environ.get("WRIT_NEWS_CACHE_TTL", "600"))
 NEWS_TIMEOUT_SECONDS = int(os.environ.get("WRIT_NEWS_TIMEOUT", "6"))
+# Shared across generator runs (each is a short-lived process); TTL by mtime
+NEWS_CACHE_FILE = Path.home() / ".writ" / "news_cache.json"
+
+# With an API key set, scripts are written over the Messages API on one pooled
+# connection instead of spawning a `claude` CLI process per segment.
+CLAUDE_API_URL = "https://api.anthropic.com/v1/messages"
+CLAUDE_API_MODEL = os.environ.get("WRIT_CLAUDE_MODEL", "claude-sonnet-4-5")
+CLAUDE_API_MAX_TOKENS = 8192
+CLAUDE_API_RETRIES = 3
+CLAUDE_BATCH_POLL_SECONDS = 15
 
 _NEWS_CACHE: dict[str, object] = {"timestamp": 0.0, "items": []}
+_NEWS_LOCK = threading.Lock()
+_SHUFFLE_DECKS: dict[str, list] = {}
+_SHUFFLE_LOCK = threading.Lock()
+_CLAUDE_CLIENT: httpx.Client | None = None
+_CLAUDE_CLIENT_LOCK = threading.Lock()
+_LOG_STAMP: tuple[int, str] = (-1, "")  # (epoch second, "HH:MM:SS") of the last log line
 
 
 def log(msg: str) -> None:
-    ts = datetime.now().strftime("%H:%M:%S")
-    print(f"[{ts}] {msg}", flush=True)
+    global _LOG_STAMP
+    second = int(time.time())
+    if second != _LOG_STAMP[0]:
+        _LOG_STAMP = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+    print(f"[{_LOG_STAMP[1]}] {msg}", flush=True)
+
+
+_TOD_BOUNDS = {
+    "default": ((6, "late_night"), (10, "morning"), (18, "daytime"), (24, "evening")),
+    "extended": (
+        (6, "late_night"), (10, "morning"), (14, "daytime"),
+        (15, "early_afternoon"), (18, "afternoon"), (24, "evening"),
+    ),
+}
+_HOUR_TO_TOD = {
+    profile: tuple(next(tod for end, tod in bounds if hour < end) for hour in range(24))
+    for profile, bounds in _TOD_BOUNDS.items()
+}
 
 
 def get_time_of_day(hour: int | None = None, profile: str = "default") -> str:
     if hour is None:
-        hour = datetime.now().hour
-
-    if profile == "extended":
-        if 6 <= hour < 10:
-            return "morning"
-        if 10 <= hour < 14:
-            return "daytime"
-        if 14 <= hour < 15:
-            return "early_afternoon"
-        if 15 <= hour < 18:
-            return "afternoon"
-        if 18 <= hour < 24:
-            return "evening"
-        return "late_night"
-
-    if 6 <= hour < 10:
-        return "morning"
-    if 10 <= hour < 18:
-        return "daytime"
-    if 18 <= hour < 24:
-        return "evening"
-    return "late_night"
+        hour = time.localtime().tm_hour
+    table = _HOUR_TO_TOD["extended" if profile == "extended" else "default"]
+    return table[hour % 24]
+
+
+_TTS_SUBS = {"[pause]": "...", "[chuckle]": "heh...", "[cough]": "ahem...", '"': ""}
+_TTS_RE = re.compile("|".join(re.escape(k) for k in _TTS_SUBS))
+_TTS_RE_NO_COUGH = re.compile("|".join(re.escape(k) for k in _TTS_SUBS if k != "[cough]"))
 
 
+@functools.lru_cache(maxsize=256)
 def preprocess_for_tts(text: str, *, include_cough: bool = True) -> str:
-    text = text.replace("[pause]", "...")
-    text = text.replace("[chuckle]", "heh...")
-    if include_cough:
-        text = text.replace("[cough]", "ahem...")
-    text = text.replace('"', "")
-    return text.strip()
+    pattern = _TTS_RE if include_cough else _TTS_RE_NO_COUGH
+    return pattern.sub(lambda m: _TTS_SUBS[m.group(0)], text).strip()
+
+
+# A lead-in line about the script itself ("Here's the monologue:", "Sure, here
+# is your script:") that would otherwise be read on air. In-character openings
+# such as "Here's what came in tonight:" name no script-ish noun and are kept.
+_META_NOUN = r"(?:script|monologue|segment|response|reply|draft|version|transcript)\b"
+_PREAMBLE_RE = re.compile(
+    r"\A\s*(?:"
+    rf"sure[,!][^\n]*?\b{_META_NOUN}[^\n]*"
+    r"|(?:here'?s|here is)\s+(?:(?:the|your|a|an|my)\s+)?(?:[\w'-]+\s+){0,4}?"
+    rf"{_META_NOUN}[^\n]*"
+    r"):[ \t]*\n+",
+    re.IGNORECASE,
+)
 
 
 def clean_claude_output(text: str, *, strip_quotes: bool = True) -> str:
-    cleaned = text.replace("*", "").replace("_", "").strip()
+    """Strip markdown emphasis, a meta lead-in line and wrapping quotes.
+
+    >>> clean_claude_output("Here's a 300-word monologue:\\n\\nThe night is long.")
+    'The night is long.'
+    >>> clean_claude_output("Sure! Here's your station ID script:\\nHello there.")
+    'Hello there.'
+    >>> clean_claude_output("Here is the script for tonight's segment:\\nWelcome back.")
+    'Welcome back.'
+    >>> clean_claude_output("Here is a question for tonight:\\nWhat is silence?")
+    'Here is a question for tonight:\\nWhat is silence?'
+    >>> clean_claude_output("Here's what came in tonight:\\nA letter from Ohio.")
+    "Here's what came in tonight:\\nA letter from Ohio."
+    >>> clean_claude_output("Sure, I remember that night:\\nThe rain came in sideways.")
+    'Sure, I remember that night:\\nThe rain came in sideways.'
+    >>> clean_claude_output("Here is where it begins. The dial turns.")
+    'Here is where it begins. The dial turns.'
+    """
+    cleaned = _PREAMBLE_RE.sub("", text.replace("*", "").replace("_", ""), count=1).strip()
     if strip_quotes and cleaned.startswith('"') and cleaned.endswith('"'):
         cleaned = cleaned[1:-1].strip()
     return cleaned
 
 
-def run_claude(
+def draw_shuffled(key: str, items: list):
+    """Draw from items without repeats until every item has been used once.
+
+    Each key keeps its own shuffled deck for the life of the process.
+    """
+    with _SHUFFLE_LOCK:
+        deck = _SHUFFLE_DECKS.get(key)
+        if not deck:
+            deck = random.sample(items, len(items))
+            _SHUFFLE_DECKS[key] = deck
+        return deck.pop()
+
+
+def _claude_client(api_key: str) -> httpx.Client:
+    """One keep-alive client shared by every script-writing thread."""
+    global _CLAUDE_CLIENT
+    with _CLAUDE_CLIENT_LOCK:
+        if _CLAUDE_CLIENT is None:
+            _CLAUDE_CLIENT = httpx.Client(headers={
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01",
+            })
+        return _CLAUDE_CLIENT
+
+
+def _claude_api(
     prompt: str,
+    api_key: str,
     *,
-    timeout: int = 60,
+    timeout: int,
+    model: str | None,
+    max_tokens: int | None = None,
+) -> str | None:
+    payload = {
+        "model": model or CLAUDE_API_MODEL,
+        "max_tokens": max_tokens or CLAUDE_API_MAX_TOKENS,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    client = _claude_client(api_key)
+    for attempt in range(CLAUDE_API_RETRIES):
+        try:
+            resp = client.post(CLAUDE_API_URL, json=payload, timeout=httpx.Timeout(timeout, connect=10.0))
+        except httpx.TimeoutException:
+            log("Claude timed out")
+            return None
+        except httpx.HTTPError as exc:
+            log(f"Claude error: {exc}")
+            return None
+
+        # Rate limited or overloaded: back off and retry, honouring retry-after
+        if resp.status_code in (429, 529) and attempt + 1 < CLAUDE_API_RETRIES:
+            try:
+                delay = float(resp.headers.get("retry-after", ""))
+            except ValueError:
+                delay = 2.0 ** (attempt + 1)
+            time.sleep(min(delay, 30.0))
+            continue
+        if resp.status_code != 200:
+            log(f"Claude API error {resp.status_code}: {resp.text[:200]}")
+            return None
+
+        try:
+            data = resp.json()
+        except ValueError as exc:
+            log(f"Claude returned an unreadable response: {exc}")
+            return None
+        if data.get("stop_reason") == "max_tokens":
+            log("Claude hit max_tokens; dropping truncated script")
+            return None
+        blocks = data.get("content", [])
+        return "".join(b.get("text", "") for b in blocks if b.get("type") == "text")
+    return None
+
+
+def run_claude_batch(
+    prompts: dict[str, str],
+    *,
+    timeout: int = 1800,
     model: str | None = None,
-    min_length: int = 0,
     strip_quotes: bool = True,
-) -> str | None:
+    max_tokens: dict[str, int] | None = None,
+) -> dict[str, str]:
+    """Write many scripts as one Message Batches job (half the per-token price).
+
+    `max_tokens` optionally caps output per custom_id. Returns
+    {custom_id: cleaned script} for the requests that succeeded. Needs
+    ANTHROPIC_API_KEY; without it, or if the batch doesn't end within
+    `timeout`, returns what it has (possibly nothing) so callers can fall back
+    to run_claude for the rest.
+    """
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not prompts or not api_key or not HAS_HTTPX:
+        return {}
+
+    client = _claude_client(api_key)
+    batches_url = f"{CLAUDE_API_URL}/batches"
+    requests = [
+        {
+            "custom_id": custom_id,
+            "params": {
+                "model": model or CLAUDE_API_MODEL,
+                "max_tokens": (max_tokens or {}).get(custom_id, CLAUDE_API_MAX_TOKENS),
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        }
+        for custom_id, prompt in prompts.items()
+    ]
+    try:
+        resp = client.post(batches_url, json={"requests": requests}, timeout=60)
+        resp.raise_for_status()
+        batch = resp.json()
+        log(f"Claude batch {batch['id']}: {len(requests)} requests submitted")
+
+        deadline = time.monotonic() + timeout
+        while batch.get("processing_status") != "ended":
+            if time.monotonic() > deadline:
+                log(f"Claude batch {batch['id']} still running after {timeout}s; cancelling")
+                client.post(f"{batches_url}/{batch['id']}/cancel", timeout=30)
+                return {}
+            time.sleep(CLAUDE_BATCH_POLL_SECONDS)
+            resp = client.get(f"{batches_url}/{batch['id']}", timeout=30)
+            resp.raise_for_status()
+            batch = resp.json()
+
+        resp = client.get(batch["results_url"], timeout=120)
+        resp.raise_for_status()
+    except (httpx.HTTPError, KeyError, ValueError) as exc:
+        log(f"Claude batch error: {exc}")
+        return {}
+
+    scripts: dict[str, str] = {}
+    for line in resp.text.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        result = entry.get("result", {})
+        message = result.get("message", {})
+        if result.get("type") != "succeeded" or message.get("stop_reason") == "max_tokens":
+            continue
+        blocks = message.get("content", [])
+        text = "".join(b.get("text", "") for b in blocks if b.get("type") == "text")
+        if text.strip():
+            scripts[entry["custom_id"]] = clean_claude_output(text, strip_quotes=strip_quotes)
+    log(f"Claude batch {batch['id']}: {len(scripts)}/{len(requests)} succeeded")
+    return scripts
+
+
+def _claude_cli(prompt: str, *, timeout: int, model: str | None) -> str | None:
     args = ["claude", "-p", prompt]
     if model:
         args.extend(["--model", model])
@@ -88,7 +287,8 @@ def run_claude(
     try:
         result = subprocess.run(
             args,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # never read; don't buffer it
             text=True,
             timeout=timeout,
         )
@@ -99,19 +299,46 @@ def run_claude(
         log(f"Claude error: {exc}")
         return None
 
-    if result.returncode != 0 or not result.stdout.strip():
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def run_claude(
+    prompt: str,
+    *,
+    timeout: int = 60,
+    model: str | None = None,
+    min_length: int = 0,
+    strip_quotes: bool = True,
+    max_tokens: int | None = None,
+) -> str | None:
+    """Write with Claude; `max_tokens` caps the output on the API path (the
+    CLI picks its own). A failed API call falls back to the CLI if installed."""
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    output = None
+    if api_key and HAS_HTTPX:
+        output = _claude_api(
+            prompt, api_key, timeout=timeout, model=model, max_tokens=max_tokens,
+        )
+        if output is None and shutil.which("claude"):
+            log("Falling back to the claude CLI")
+            output = _claude_cli(prompt, timeout=timeout, model=model)
+    else:
+        output = _claude_cli(prompt, timeout=timeout, model=model)
+
+    if not output or not output.strip():
         return None
 
-    script = clean_claude_output(result.stdout, strip_quotes=strip_quotes)
+    script = clean_claude_output(output, strip_quotes=strip_quotes)
     if len(script) <= min_length:
         return None
     return script
 
 
 def _strip_namespace(tag: str) -> str:
-    if "}" in tag:
-        return tag.split("}", 1)[1]
-    return tag
+    # "{ns}name" -> "name"; one C-level call, no membership test and split
+    return tag.rpartition("}")[2]
 
 
 def _find_child_text(elem: ET.Element, name: str) -> str:
@@ -121,6 +348,20 @@ def _find_child_text(elem: ET.Element, name: str) -> str:
     return ""
 
 
+def _feed_items(root: ET.Element):
+    """Items/entries of a parsed feed.
+
+    RSS 2.0 and namespaced Atom are filtered by exact tag inside ElementTree's
+    C iterator; other shapes (e.g. RSS 1.0/RDF) fall back to checking every
+    element's local name.
+    """
+    if root.tag == "rss":
+        return root.iter("item")
+    if root.tag.endswith("}feed"):
+        return root.iter(root.tag[:-len("feed")] + "entry")
+    return (e for e in root.iter() if _strip_namespace(e.tag) in ("item", "entry"))
+
+
 def _extract_source_title(root: ET.Element, fallback: str) -> str:
     tag = _strip_namespace(root.tag)
     if tag == "rss":
@@ -134,11 +375,54 @@ def _extract_source_title(root: ET.Element, fallback: str) -> str:
     return fallback
 
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _normalize_title(title: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", title.lower()).strip()
+    return _NON_ALNUM_RE.sub(" ", title.lower()).strip()
+
+
+def _download_feed(feed_url: str) -> bytes | None:
+    try:
+        with urllib.request.urlopen(feed_url, timeout=NEWS_TIMEOUT_SECONDS) as response:
+            return response.read()
+    except Exception:
+        return None
 
 
 def fetch_headlines(max_items: int | None = None) -> list[dict]:
+    # Scripts are written on several threads; the first caller refreshes the
+    # cache and the others wait for it instead of fetching the same feeds.
+    with _NEWS_LOCK:
+        return _fetch_headlines(max_items)
+
+
+def _load_news_file(key: str, now: float) -> list[dict] | None:
+    try:
+        mtime = NEWS_CACHE_FILE.stat().st_mtime
+        if now - mtime >= NEWS_CACHE_TTL_SECONDS:
+            return None
+        data = json.loads(NEWS_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key or not data.get("items"):
+        return None
+    _NEWS_CACHE["timestamp"] = mtime
+    _NEWS_CACHE["items"] = list(data["items"])
+    return data["items"]
+
+
+def _save_news_file(key: str, headlines: list[dict]) -> None:
+    try:
+        NEWS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = NEWS_CACHE_FILE.with_name(f".{NEWS_CACHE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": key, "items": headlines}))
+        os.replace(tmp, NEWS_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _fetch_headlines(max_items: int | None) -> list[dict]:
     now = time.time()
     cached_items = _NEWS_CACHE.get("items", [])
     if cached_items and now - float(_NEWS_CACHE.get("timestamp", 0.0)) < NEWS_CACHE_TTL_SECONDS:
@@ -149,13 +433,24 @@ def fetch_headlines(max_items: int | None = None) -> list[dict]:
     feeds = [f.strip() for f in feed_env.split(",")] if feed_env else list(DEFAULT_NEWS_FEEDS)
     feeds = [f for f in feeds if f]
 
+    # Another run may have fetched these feeds moments ago
+    cache_key = json.dumps([feeds, max_items])
+    cached_items = _load_news_file(cache_key, now)
+    if cached_items:
+        return list(cached_items)
+
     headlines: list[dict] = []
     seen: set[str] = set()
 
-    for feed_url in feeds:
+    # Download all feeds at once (wait = slowest feed, not the sum), then
+    # parse in configured order so earlier feeds still win dedupe and the cap.
+    with ThreadPoolExecutor(max_workers=max(1, len(feeds))) as pool:
+        contents = list(pool.map(_download_feed, feeds))
+
+    for feed_url, content in zip(feeds, contents):
+        if content is None:
+            continue
         try:
-            with urllib.request.urlopen(feed_url, timeout=NEWS_TIMEOUT_SECONDS) as response:
-                content = response.read()
             root = ET.fromstring(content)
         except Exception:
             continue
@@ -163,10 +458,7 @@ def fetch_headlines(max_items: int | None = None) -> list[dict]:
         fallback = urllib.parse.urlparse(feed_url).netloc or "Unknown Source"
         source = _extract_source_title(root, fallback)
 
-        for elem in root.iter():
-            tag = _strip_namespace(elem.tag)
-            if tag not in ("item", "entry"):
-                continue
+        for elem in _feed_items(root):
             title = _find_child_text(elem, "title")
             if not title:
                 continue
@@ -182,6 +474,8 @@ def fetch_headlines(max_items: int | None = None) -> list[dict]:
 
     _NEWS_CACHE["timestamp"] = now
     _NEWS_CACHE["items"] = list(headlines)
+    if headlines:
+        _save_news_file(cache_key, headlines)
     return headlines
 
 
@@ -206,9 +500,54 @@ _PROJECT_ROOT = Path(__file__).resolve().parents[2]
 _KOKORO_DIR = _PROJECT_ROOT / "mac" / "kokoro"
 _KOKORO_PYTHON = _KOKORO_DIR / ".venv" / "bin" / "python"
 
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(_PROJECT_ROOT))
+from mac.kokoro import tts as kokoro_tts  # noqa: E402
+
+
+@functools.cache
+def ensure_dir(path: Path) -> Path:
+    """mkdir -p once per process. Only for directories nothing else removes;
+    slot folders get archived by the feeder, so they are created per use."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+_INDEX_LOCK = threading.Lock()
+
+
+def append_script_index(scripts_dir: Path, record: dict) -> None:
+    """Append one segment's metadata as a line of scripts_dir/index.jsonl."""
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _INDEX_LOCK, open(ensure_dir(scripts_dir) / "index.jsonl", "a") as f:
+        f.write(line)
+
+
+def staging_path(output_path: Path) -> Path:
+    """Scratch path to render output_path into before publishing it.
+
+    The hidden .rendering/ folder sits next to the final file, so the move
+    into place is a single atomic os.replace. It is outside the *.wav glob
+    the feeder and the stock counters use, so a render that dies halfway is
+    never played or counted as stock.
+    """
+    staging = output_path.parent / ".rendering"
+    staging.mkdir(parents=True, exist_ok=True)
+    return staging / output_path.name
+
 
 def get_audio_duration(filepath: Path) -> float | None:
-    """Get audio duration in seconds via ffprobe."""
+    """Get audio duration in seconds.
+
+    WAV files (everything the TTS path writes) are read from the header;
+    other formats fall back to ffprobe.
+    """
+    if filepath.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(filepath), "rb") as wf:
+                return wf.getnframes() / float(wf.getframerate())
+        except (wave.Error, EOFError, OSError):
+            pass
     try:
         result = subprocess.run(
             ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
@@ -222,53 +561,57 @@ def get_audio_duration(filepath: Path) -> float | None:
     return None
 
 
-def render_kokoro(text: str, output_path: Path, voice: str = "am_michael") -> bool:
-    """Render text to speech using Kokoro TTS."""
-    if not _KOKORO_PYTHON.exists():
-        log("Kokoro venv not found")
+def publish_staged(render_path: Path, output_path: Path) -> bool:
+    """Move a finished render into place; False if the renderer left no file."""
+    try:
+        os.replace(render_path, output_path)
+    except FileNotFoundError:
         return False
+    return True
 
-    escaped_text = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
-
-    tts_script = f'''
-import warnings
-warnings.filterwarnings("ignore")
 
-from kokoro import KPipeline
-import soundfile as sf
-import numpy as np
+@functools.cache
+def _kokoro_venv_exists() -> bool:
+    return _KOKORO_PYTHON.exists()
 
-pipe = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
 
-text = "{escaped_text}"
-voice = "{voice}"
+def warmup_kokoro() -> bool:
+    """Bring up the shared Kokoro server before any scripts are written."""
+    if not _kokoro_venv_exists():
+        log("Kokoro venv not found")
+        return False
+    try:
+        if kokoro_tts.warmup():
+            return True
+    except Exception as e:
+        log(f"Kokoro error: {e}")
+        return False
+    log("Kokoro server unavailable")
+    return False
 
-generator = pipe(text, voice=voice, speed=1.0)
-audio_segments = []
-for _, _, audio in generator:
-    audio_segments.append(audio)
 
-if len(audio_segments) == 1:
-    full_audio = audio_segments[0]
-else:
-    full_audio = np.concatenate(audio_segments)
+def render_kokoro(text: str, output_path: Path, voice: str = "am_michael") -> bool:
+    """Render text to speech using Kokoro TTS (shared server, see mac/kokoro/tts.py)."""
+    if not _kokoro_venv_exists():
+        log("Kokoro venv not found")
+        return False
+    try:
+        return kokoro_tts.render_speech(text, output_path, voice=voice)
+    except Exception as e:
+        log(f"Kokoro error: {e}")
+        return False
 
-sf.write("{output_path}", full_audio, 24000)
-print("SUCCESS")
-'''
 
+def render_kokoro_batch(items: list[tuple[str, Path]], voice: str = "am_michael") -> list[bool]:
+    """Render several (text, output_path) pairs in one Kokoro round trip."""
+    if not _kokoro_venv_exists():
+        log("Kokoro venv not found")
+        return [False] * len(items)
     try:
-        result = subprocess.run(
-            [str(_KOKORO_PYTHON), "-c", tts_script],
-            capture_output=True,
-            text=True,
-            timeout=300,
-            cwd=str(_KOKORO_DIR),
-        )
-        return "SUCCESS" in result.stdout
+        return kokoro_tts.render_speech_batch(items, voice=voice)
     except Exception as e:
         log(f"Kokoro error: {e}")
-        return False
+        return [False] * len(items)
 
 
 def concatenate_audio(chunk_files: list[Path], output_path: Path, gap_seconds: float = 0) -> bool:
@@ -347,15 +690,17 @@ def render_single_voice(text: str, output_path: Path, voice: str) -> bool:
     import tempfile
     tmp_dir = Path(tempfile.mkdtemp(prefix="writ_chunks_"))
 
+    chunk_paths = [tmp_dir / f"chunk{i:03d}.wav" for i in range(len(chunks))]
+    rendered = render_kokoro_batch(list(zip(chunks, chunk_paths)), voice)
+
     chunk_files: list[Path] = []
     failed_chunks = 0
-    for i, chunk in enumerate(chunks):
-        chunk_path = tmp_dir / f"chunk{i:03d}.wav"
-        for attempt in range(2):
-            if render_kokoro(chunk, chunk_path, voice):
-                chunk_files.append(chunk_path)
-                break
+    for chunk, chunk_path, ok in zip(chunks, chunk_paths, rendered):
+        if not ok:
             time.sleep(2)
+            ok = render_kokoro(chunk, chunk_path, voice)  # one retry, like before
+        if ok:
+            chunk_files.append(chunk_path)
         else:
             failed_chunks += 1
 
@@ -89,6 +89,7 @@ def ingest_messages(show_id: str | None = None) -> int:
         return 0
 
     added = 0
+    now = datetime.now()
     for msg in messages:
         text = str(msg.get("message", "")).strip()
         ts = str(msg.get("timestamp", "")).strip()
@@ -96,7 +97,7 @@ def ingest_messages(show_id: str | None = None) -> int:
             continue
         quality, tags = classify_message(text)
         eid = event_id("msg", ts, text)
-        expires = datetime.now() + timedelta(days=14 if quality == "substantive" else 3)
+        expires = now + timedelta(days=14 if quality == "substantive" else 3)
         event = {
             "id": eid,
             "type": "listener_message",
@@ -129,7 +130,10 @@ def load_active_threads() -> list[dict[str, Any]]:
 
 def save_active_threads(threads: list[dict[str, Any]]) -> None:
     WRIT_HOME.mkdir(parents=True, exist_ok=True)
-    ACTIVE_THREADS_PATH.write_text(json.dumps({"threads": threads}, indent=2, ensure_ascii=False))
+    # Context briefs read this while generators may be saving it; swap it in whole
+    tmp = ACTIVE_THREADS_PATH.with_name(f".{ACTIVE_THREADS_PATH.name}.tmp")
+    tmp.write_text(json.dumps({"threads": threads}, indent=2, ensure_ascii=False))
+    tmp.replace(ACTIVE_THREADS_PATH)
 
 
 def add_thread(thread_id: str, title: str, summary: str, shows: list[str], cooldown_hours: int = 48) -> None:
@@ -20,9 +20,8 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -32,7 +31,10 @@ import os
 # Ensure Claude CLI can run (may be blocked inside a Claude Code session)
 os.environ.pop("CLAUDECODE", None)
 
-from helpers import log, preprocess_for_tts, run_claude, render_single_voice, get_audio_duration
+from helpers import (
+    log, preprocess_for_tts, run_claude, render_single_voice, get_audio_duration,
+    staging_path, publish_staged, append_script_index, warmup_kokoro,
+)
 from persona import build_host_prompt, get_host, STATION_NAME
 from ledger import append_event, event_id, ingest_messages
 
@@ -40,15 +42,18 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 SCHEDULE_PATH = PROJECT_ROOT / "config" / "schedule.yaml"
 OUTPUT_DIR = PROJECT_ROOT / "output" / "talk_segments"
 SCRIPTS_DIR = PROJECT_ROOT / "output" / "scripts"
-MESSAGES_FILE = Path.home() / ".writ" / "messages.json"
 
 sys.path.insert(0, str(PROJECT_ROOT / "mac"))
+import message_queue
 from schedule import load_schedule, slot_key
 
+MESSAGES_FILE = message_queue.MESSAGES_FILE
+
 # Short segments for quick turnaround
 WORD_TARGET_SINGLE = (100, 200)   # One message: short personal reply
 WORD_TARGET_BATCH = (250, 400)    # 2-3 messages: mini mailbag
 MAX_BATCH = 3                     # Max messages per segment
+SCRIPT_WORKERS = int(os.environ.get("WRIT_SCRIPT_WORKERS", "3"))  # Concurrent Claude calls
 
 # Minimum message length to bother responding to
 MIN_MESSAGE_LENGTH = 2
@@ -61,18 +66,7 @@ MIN_MESSAGE_LENGTH = 2
 
 def load_messages() -> list[dict]:
     """Load all messages from the messages file."""
-    if not MESSAGES_FILE.exists():
-        return []
-    try:
-        return json.loads(MESSAGES_FILE.read_text())
-    except Exception:
-        return []
-
-
-def save_messages(messages: list[dict]) -> None:
-    """Write messages back to file."""
-    MESSAGES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    MESSAGES_FILE.write_text(json.dumps(messages, indent=2))
+    return message_queue.load_messages(MESSAGES_FILE)
 
 
 def get_unread_messages() -> list[dict]:
@@ -88,15 +82,14 @@ def get_unread_messages() -> list[dict]:
 
 def mark_messages_read(timestamps: list[str]) -> None:
     """Mark specific messages as read by timestamp."""
-    messages = load_messages()
     ts_set = set(timestamps)
     now = datetime.now().isoformat()
-    for m in messages:
-        if m.get("timestamp") in ts_set:
-            m["read"] = True
-            m["processed_at"] = now
-            m["processing_note"] = "listener_response_daemon"
-    save_messages(messages)
+    with message_queue.update_messages(MESSAGES_FILE) as messages:
+        for m in messages:
+            if m.get("timestamp") in ts_set:
+                m["read"] = True
+                m["processed_at"] = now
+                m["processing_note"] = "listener_response_daemon"
 
 
 # =============================================================================
@@ -107,6 +100,7 @@ def mark_messages_read(timestamps: list[str]) -> None:
 def format_messages_for_prompt(messages: list[dict]) -> str:
     """Format listener messages for the generation prompt."""
     lines = []
+    now = datetime.now()
     for i, m in enumerate(messages, 1):
         msg = m["message"].strip()
         ts = m.get("timestamp", "")
@@ -115,7 +109,7 @@ def format_messages_for_prompt(messages: list[dict]) -> str:
         if ts:
             try:
                 msg_time = datetime.fromisoformat(ts)
-                delta = datetime.now() - msg_time
+                delta = now - msg_time
                 if delta.days > 0:
                     time_note = f" (sent {delta.days} day{'s' if delta.days > 1 else ''} ago)"
                 elif delta.seconds > 3600:
@@ -219,94 +213,115 @@ def process_messages(max_batch: int = MAX_BATCH) -> int:
         voice = "am_michael"
         slot = datetime.now().strftime("%Y-%m-%d_%H00")
 
+    # Leave the messages unread for the next run rather than writing replies
+    # that can't be rendered
+    if not warmup_kokoro():
+        log("Kokoro TTS is not available, skipping listener responses")
+        return 0
+
     log(f"Current show: {show_name} (host: {host_id}, voice: {voice})")
     log(f"Writing into slot: {slot}")
 
-    # Process in batches
-    total_processed = 0
-    while unread:
-        batch = unread[:max_batch]
-        unread = unread[max_batch:]
-
-        msg_preview = "; ".join(m["message"][:40] for m in batch)
-        log(f"Processing batch of {len(batch)}: {msg_preview}...")
-
-        # Generate script
-        prompt = build_response_prompt(
+    batches = [unread[i:i + max_batch] for i in range(0, len(unread), max_batch)]
+    prompts = [
+        build_response_prompt(
             host_id=host_id,
             show_name=show_name,
             show_description=show_description,
             topic_focus=topic_focus,
             messages=batch,
         )
+        for batch in batches
+    ]
 
-        script = run_claude(prompt, timeout=120, min_length=30)
-        if not script:
-            log("  Script generation failed, skipping batch")
-            # Still mark as read so we don't retry endlessly
-            mark_messages_read([m["timestamp"] for m in batch])
-            total_processed += len(batch)
-            continue
-
-        word_count = len(script.split())
-        log(f"  Generated {word_count} words")
-
-        # Prepare TTS
-        processed = preprocess_for_tts(script)
-
-        # Output path — into current slot folder (plays this airing only)
-        slot_dir = OUTPUT_DIR / show_id / slot
-        slot_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = slot_dir / f"listener_response_{timestamp}.wav"
-
-        log("  Rendering audio...")
-        if render_single_voice(processed, output_path, voice):
-            duration = get_audio_duration(output_path)
-            duration_str = f"{int(duration // 60)}:{int(duration % 60):02d}" if duration else "?"
-            log(f"  Created: {output_path.name} ({duration_str})")
-
-            # Save script metadata
-            SCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-            meta_path = SCRIPTS_DIR / f"listener_response_{timestamp}.json"
-            meta_path.write_text(json.dumps({
-                "type": "listener_response",
-                "show_id": show_id,
-                "show_name": show_name,
-                "host": host_id,
-                "messages": [m["message"] for m in batch],
-                "script": script,
-                "word_count": word_count,
-                "duration_seconds": duration,
-                "voice": voice,
-                "generated_at": datetime.now().isoformat(),
-            }, indent=2))
-            append_event({
-                "id": event_id("resp", str(output_path), datetime.now().isoformat(timespec="seconds")),
-                "type": "listener_response_generated",
-                "time": datetime.now().isoformat(timespec="seconds"),
-                "show_id": show_id,
-                "host": host_id,
-                "messages": [m["message"] for m in batch],
-                "path": str(output_path),
-                "word_count": word_count,
-                "duration_seconds": duration,
-                "tags": ["listener_response", show_id],
-            })
-        else:
-            log("  TTS rendering failed")
-
-        # Mark as read regardless (don't retry failed messages forever)
-        mark_messages_read([m["timestamp"] for m in batch])
-        total_processed += len(batch)
-
-        # Brief pause between batches
-        if unread:
-            time.sleep(2)
+    # Write every batch's script concurrently (Claude calls are network-bound);
+    # render them one at a time, in order, as they come back.
+    total_processed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRIPT_WORKERS, len(batches)))) as pool:
+        futures = [pool.submit(run_claude, prompt, timeout=120, min_length=30) for prompt in prompts]
+        for batch, future in zip(batches, futures):
+            total_processed += _publish_response(
+                batch, future.result(), show_id, show_name, host_id, voice, slot,
+            )
 
     return total_processed
 
 
+def _publish_response(
+    batch: list[dict],
+    script: str | None,
+    show_id: str,
+    show_name: str,
+    host_id: str,
+    voice: str,
+    slot: str,
+) -> int:
+    """Render one batch's script into the slot and mark its messages read."""
+    msg_preview = "; ".join(m["message"][:40] for m in batch)
+    log(f"Processing batch of {len(batch)}: {msg_preview}...")
+
+    if not script:
+        log("  Script generation failed, skipping batch")
+        # Still mark as read so we don't retry endlessly
+        mark_messages_read([m["timestamp"] for m in batch])
+        return len(batch)
+
+    word_count = len(script.split())
+    log(f"  Generated {word_count} words")
+
+    # Prepare TTS
+    processed = preprocess_for_tts(script)
+
+    # Output path — into current slot folder (plays this airing only;
+    # staging_path below creates it)
+    slot_dir = OUTPUT_DIR / show_id / slot
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = slot_dir / f"listener_response_{timestamp}.wav"
+
+    log("  Rendering audio...")
+    render_path = staging_path(output_path)
+    if render_single_voice(processed, render_path, voice) and publish_staged(render_path, output_path):
+        finished = datetime.now()
+        finished_at = finished.isoformat(timespec="seconds")
+        duration = get_audio_duration(output_path)
+        duration_str = f"{int(duration // 60)}:{int(duration % 60):02d}" if duration else "?"
+        log(f"  Created: {output_path.name} ({duration_str})")
+
+        # Save script metadata
+        append_script_index(SCRIPTS_DIR, {
+            "id": f"listener_response_{timestamp}",
+            "type": "listener_response",
+            "show_id": show_id,
+            "show_name": show_name,
+            "host": host_id,
+            "messages": [m["message"] for m in batch],
+            "script": script,
+            "word_count": word_count,
+            "duration_seconds": duration,
+            "voice": voice,
+            "generated_at": finished.isoformat(),
+        })
+        append_event({
+            "id": event_id("resp", str(output_path), finished_at),
+            "type": "listener_response_generated",
+            "time": finished_at,
+            "show_id": show_id,
+            "host": host_id,
+            "messages": [m["message"] for m in batch],
+            "path": str(output_path),
+            "word_count": word_count,
+            "duration_seconds": duration,
+            "tags": ["listener_response", show_id],
+        })
+    else:
+        log("  TTS rendering failed")
+        render_path.unlink(missing_ok=True)
+
+    # Mark as read regardless (don't retry failed messages forever)
+    mark_messages_read([m["timestamp"] for m in batch])
+    return len(batch)
+
+
 # =============================================================================
 # CLI
 # =============================================================================
@@ -21,6 +21,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT / "mac"))
 
+from helpers import draw_shuffled, ensure_dir
 from music_gen_client import MUSIC_GEN_BASE_URL, generate_music, is_server_available
 
 BUMPERS_DIR = PROJECT_ROOT / "output" / "music_bumpers"
@@ -318,7 +319,7 @@ def generate_one_bumper(show_id: str, verbose: bool = True) -> bool:
         print(f"Unknown show: {show_id}")
         return False
 
-    entry = random.choice(SHOW_MUSIC[show_id])
+    entry = draw_shuffled(f"music:{show_id}", SHOW_MUSIC[show_id])
 
     # Entry is either a plain caption string (instrumental) or a dict with lyrics
     if isinstance(entry, dict):
@@ -332,8 +333,7 @@ def generate_one_bumper(show_id: str, verbose: bool = True) -> bool:
 
     duration = round(random.uniform(BUMPER_MIN, BUMPER_MAX), 1)
 
-    show_dir = BUMPERS_DIR / show_id
-    show_dir.mkdir(parents=True, exist_ok=True)
+    show_dir = ensure_dir(BUMPERS_DIR / show_id)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     audio_path = show_dir / f"{show_id}_bumper_{timestamp}.flac"
     meta_path = audio_path.with_suffix(".json")
@@ -361,7 +361,10 @@ def generate_one_bumper(show_id: str, verbose: bool = True) -> bool:
             "ai_generated": True,
             "model": "ace-step",
         }
-        meta_path.write_text(json.dumps(meta, indent=2))
+        # The feeder reads this for display names; swap it in whole
+        tmp = meta_path.with_name(f".{meta_path.name}.tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        tmp.replace(meta_path)
         if verbose:
             print(f"  Saved: {audio_path.name} ({elapsed:.0f}s)")
         return True
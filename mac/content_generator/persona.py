@@ -274,6 +274,21 @@ TIME_PERIOD_MOODS = {
     },
 }
 
+# Hour -> period lookup, derived once from the boundaries below.
+_PERIOD_BOUNDS = (
+    (6, "late_night"),
+    (10, "early_morning"),
+    (14, "morning"),
+    (15, "early_afternoon"),
+    (18, "afternoon"),
+    (21, "evening"),
+    (24, "night"),
+)
+_HOUR_TO_PERIOD = tuple(
+    next(period for end, period in _PERIOD_BOUNDS if hour < end)
+    for hour in range(24)
+)
+
 # =============================================================================
 # HOST ACCESS FUNCTIONS
 # =============================================================================
@@ -286,16 +301,20 @@ def get_host(persona_id: str) -> dict:
     return HOSTS[persona_id]
 
 
-def build_host_prompt(persona_id: str, show_context: dict | None = None) -> str:
-    """Build a complete system prompt for a host.
+_HOST_BLOCKS: dict[str, str] = {}
 
-    Args:
-        persona_id: Key into HOSTS dict
-        show_context: Optional dict with show_name, show_description, topic_focus, segment_type
-    """
-    host = get_host(persona_id)
 
-    prompt = f"""You are {host['name']}, a host on {STATION_NAME}.
+def _host_block(persona_id: str) -> str:
+    """The static part of a host's system prompt, built once per persona.
+
+    Not marked for prompt caching: at roughly 370-570 tokens (about 700 with
+    a segment template) it is below the API's minimum cacheable prefix, so a
+    cache_control mark would be ignored.
+    """
+    block = _HOST_BLOCKS.get(persona_id)
+    if block is None:
+        host = get_host(persona_id)
+        block = f"""You are {host['name']}, a host on {STATION_NAME}.
 
 {host['identity'].strip()}
 
@@ -307,6 +326,18 @@ Your beliefs:
 
 {host['anti_patterns'].strip()}
 """
+        _HOST_BLOCKS[persona_id] = block
+    return block
+
+
+def build_host_prompt(persona_id: str, show_context: dict | None = None) -> str:
+    """Build a complete system prompt for a host.
+
+    Args:
+        persona_id: Key into HOSTS dict
+        show_context: Optional dict with show_name, show_description, topic_focus, segment_type
+    """
+    prompt = _host_block(persona_id)
 
     if show_context:
         prompt += f"""
@@ -318,8 +349,8 @@ Topic Focus: {show_context.get('topic_focus', '')}
             prompt += f"Segment Type: {show_context['segment_type']}\n"
 
     # Add time context
-    ctx = get_operator_context()
     now = datetime.now()
+    ctx = get_operator_context(now=now)
     prompt += f"""
 CURRENT STATE:
 Date: {now.strftime('%A, %B %d, %Y')}
@@ -330,27 +361,15 @@ Mood: {ctx['mood']}
     return prompt
 
 
-def get_operator_context(hour: int | None = None) -> dict:
+def get_operator_context(hour: int | None = None, now: datetime | None = None) -> dict:
     """Get the full operator context for the current time."""
+    if now is None:
+        now = datetime.now()
     if hour is None:
-        hour = datetime.now().hour
+        hour = now.hour
 
     time_of_day = get_time_of_day(hour)
-
-    if 0 <= hour < 6:
-        period = "late_night"
-    elif 6 <= hour < 10:
-        period = "early_morning"
-    elif 10 <= hour < 14:
-        period = "morning"
-    elif 14 <= hour < 15:
-        period = "early_afternoon"
-    elif 15 <= hour < 18:
-        period = "afternoon"
-    elif 18 <= hour < 21:
-        period = "evening"
-    else:
-        period = "night"
+    period = _HOUR_TO_PERIOD[hour % 24]
 
     period_info = TIME_PERIOD_MOODS.get(period, TIME_PERIOD_MOODS["night"])
 
@@ -361,7 +380,7 @@ def get_operator_context(hour: int | None = None) -> dict:
         "mood": period_info["mood"],
         "operator_state": period_info["operator_state"],
         "preferred_segments": period_info["segment_types"],
-        "current_time": datetime.now().strftime("%H:%M"),
+        "current_time": now.strftime("%H:%M"),
     }
 
 
@@ -25,6 +25,7 @@ Usage:
     uv run python talk_generator.py --show midnight_signal --count 5
     uv run python talk_generator.py --type deep_dive --topic "why vinyl matters"
     uv run python talk_generator.py --all --count 3                # 3 per show
+    uv run python talk_generator.py --all --batch                  # via Message Batches (API key)
 """
 
 from __future__ import annotations
@@ -36,6 +37,7 @@ import random
 import subprocess
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -43,8 +45,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from helpers import (
-    log, preprocess_for_tts, fetch_headlines, format_headlines, run_claude,
+    log, preprocess_for_tts, fetch_headlines, format_headlines, run_claude, run_claude_batch,
     render_kokoro, render_single_voice, concatenate_audio, get_audio_duration,
+    draw_shuffled, staging_path, publish_staged, ensure_dir, append_script_index, warmup_kokoro,
 )
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -54,8 +57,11 @@ SCRIPTS_DIR = PROJECT_ROOT / "output" / "scripts"
 SHOW_LOG_DIR = PROJECT_ROOT / "output" / "show_logs"
 MESSAGES_FILE = Path.home() / ".writ" / "messages.json"
 
+# Claude calls to keep in flight ahead of TTS in generate_for_show
+SCRIPT_WORKERS = int(os.environ.get("WRIT_SCRIPT_WORKERS", "3"))
+
 sys.path.insert(0, str(PROJECT_ROOT / "mac"))
-from schedule import load_schedule, StationSchedule, slot_key, parse_slot_key
+from schedule import load_schedule, Show, StationSchedule, slot_key, parse_slot_key
 
 sys.path.insert(0, str(Path(__file__).parent))
 from persona import HOSTS, get_host, build_host_prompt, STATION_NAME
@@ -279,11 +285,11 @@ def read_show_log(show_id: str, n: int = 10) -> list[dict]:
 
 def append_show_log(show_id: str, segment_type: str, topic: str, summary: str):
     """Append an entry to a show's log after generating a segment."""
-    SHOW_LOG_DIR.mkdir(parents=True, exist_ok=True)
-    log_file = SHOW_LOG_DIR / f"{show_id}.jsonl"
+    log_file = ensure_dir(SHOW_LOG_DIR) / f"{show_id}.jsonl"
+    now = datetime.now()
     entry = {
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "hour": datetime.now().hour,
+        "date": now.strftime("%Y-%m-%d"),
+        "hour": now.hour,
         "type": segment_type,
         "topic": topic,
         "summary": summary,
@@ -498,8 +504,13 @@ def generate_planned_show(
 # =============================================================================
 
 
-def select_topic(topic_focus: str, segment_type: str, show_id: str | None = None) -> str:
-    """Pick a topic, avoiding recent ones from the show log."""
+def select_topic(
+    topic_focus: str,
+    segment_type: str,
+    show_id: str | None = None,
+    exclude: set[str] | None = None,
+) -> str:
+    """Pick a topic, avoiding recent ones from the show log (and `exclude`)."""
     pool = TOPIC_POOLS.get(topic_focus, [])
     if not pool:
         all_topics = []
@@ -515,6 +526,11 @@ def select_topic(topic_focus: str, segment_type: str, show_id: str | None = None
         if fresh:
             pool = fresh
 
+    if exclude:
+        fresh = [t for t in pool if t not in exclude]
+        if fresh:
+            pool = fresh
+
     return random.choice(pool)
 
 
@@ -550,7 +566,7 @@ def build_generation_prompt(
         headline_text = format_headlines(headlines) if headlines else "No headlines available - discuss the nature of news itself."
         prompt_template = prompt_template.format(headlines=headline_text)
     elif segment_type == "interview":
-        guest = random.choice(INTERVIEW_GUESTS)
+        guest = draw_shuffled("interview_guests", INTERVIEW_GUESTS)
         prompt_template = prompt_template.format(guest_name=guest["name"])
         topic = f"{topic} (Guest context: {guest['context']})"
     elif segment_type == "panel":
@@ -602,22 +618,32 @@ TARGET LENGTH: {min_words}-{max_words} words
 
 
 def run_generation(prompt: str, segment_type: str) -> str | None:
-    """Run Claude CLI to generate the script."""
-    min_words, max_words = SEGMENT_WORD_TARGETS.get(segment_type, (1500, 2500))
+    """Run Claude to generate the script."""
+    _, max_words = SEGMENT_WORD_TARGETS.get(segment_type, (1500, 2500))
     timeout = 120 if max_words < 200 else 300
 
-    script = run_claude(prompt, timeout=timeout)
-    if not script:
+    script = run_claude(prompt, timeout=timeout, max_tokens=segment_max_tokens(segment_type))
+    if not script or not meets_word_target(script, segment_type):
         return None
+    return script
+
+
+def segment_max_tokens(segment_type: str) -> int:
+    """Output cap for a segment: ~2 tokens per word of the upper target plus
+    room for stage directions, so only runaway output is cut off."""
+    _, max_words = SEGMENT_WORD_TARGETS.get(segment_type, (1500, 2500))
+    return max_words * 2 + 256
+
 
-    # Quality gate: check word count
+def meets_word_target(script: str, segment_type: str) -> bool:
+    """Quality gate: reject scripts well short of the segment's word target."""
+    min_words, _ = SEGMENT_WORD_TARGETS.get(segment_type, (1500, 2500))
     word_count = len(script.split())
     min_acceptable = int(min_words * 0.8)
     if word_count < min_acceptable:
         log(f"Script too short: {word_count} words (need {min_acceptable}+)")
-        return None
-
-    return script
+        return False
+    return True
 
 
 # =============================================================================
@@ -710,7 +736,7 @@ def render_multi_voice(script: str, output_path: Path, voices: dict[str, str]) -
 # =============================================================================
 
 
-def generate_segment(
+def write_segment_script(
     show_id: str,
     show_name: str,
     show_description: str,
@@ -718,14 +744,12 @@ def generate_segment(
     topic_focus: str,
     segment_type: str,
     voices: dict[str, str],
-    slot: str,
     topic: str | None = None,
-    sequence: int | None = None,
     plan_note: str | None = None,
     prior_segments: list[str] | None = None,
     intent_context: str | None = None,
-) -> Path | None:
-    """Generate a single talk segment with audio."""
+) -> tuple[str, str] | None:
+    """Generate the script for a talk segment. Returns (topic, script)."""
     if topic is None:
         topic = select_topic(topic_focus, segment_type, show_id=show_id)
 
@@ -761,16 +785,77 @@ def generate_segment(
             time.sleep(3)
 
     if not script:
-        log("  Failed to generate script")
+        log(f"  Failed to generate script ({segment_type}: {topic[:40]})")
         return None
 
     word_count = len(script.split())
     est_minutes = word_count / 130
     log(f"  Generated {word_count} words (~{est_minutes:.1f} min)")
+    return topic, script
+
 
-    # Prepare output (into slot subfolder — only plays during that airing)
+def generate_segment(
+    show_id: str,
+    show_name: str,
+    show_description: str,
+    host_id: str,
+    topic_focus: str,
+    segment_type: str,
+    voices: dict[str, str],
+    slot: str,
+    topic: str | None = None,
+    sequence: int | None = None,
+    plan_note: str | None = None,
+    prior_segments: list[str] | None = None,
+    intent_context: str | None = None,
+) -> Path | None:
+    """Generate a single talk segment with audio."""
+    written = write_segment_script(
+        show_id=show_id,
+        show_name=show_name,
+        show_description=show_description,
+        host_id=host_id,
+        topic_focus=topic_focus,
+        segment_type=segment_type,
+        voices=voices,
+        topic=topic,
+        plan_note=plan_note,
+        prior_segments=prior_segments,
+        intent_context=intent_context,
+    )
+    if not written:
+        return None
+    topic, script = written
+    return render_segment(
+        show_id=show_id,
+        show_name=show_name,
+        host_id=host_id,
+        segment_type=segment_type,
+        voices=voices,
+        slot=slot,
+        topic=topic,
+        script=script,
+        sequence=sequence,
+    )
+
+
+def render_segment(
+    show_id: str,
+    show_name: str,
+    host_id: str,
+    segment_type: str,
+    voices: dict[str, str],
+    slot: str,
+    topic: str,
+    script: str,
+    sequence: int | None = None,
+) -> Path | None:
+    """Render a generated script to audio and record it in the show memory."""
+    word_count = len(script.split())
+
+    # Prepare output (into slot subfolder — only plays during that airing;
+    # staging_path below creates it)
     slot_dir = OUTPUT_DIR / show_id / slot
-    slot_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     topic_slug = topic[:30].lower()
@@ -788,35 +873,38 @@ def generate_segment(
     log("  Rendering audio...")
     is_multi_voice = segment_type in ("panel", "interview")
 
+    render_path = staging_path(output_path)
+
     if is_multi_voice:
-        success = render_multi_voice(processed, output_path, voices)
+        success = render_multi_voice(processed, render_path, voices)
     else:
         host_voice = voices.get("host", "am_michael")
-        success = render_single_voice(processed, output_path, host_voice)
+        success = render_single_voice(processed, render_path, host_voice)
 
-    if not success or not output_path.exists():
+    if not success or not publish_staged(render_path, output_path):
         log("  TTS rendering failed")
+        render_path.unlink(missing_ok=True)
         return None
 
     # Get duration and save metadata
+    finished = datetime.now()
+    finished_at = finished.isoformat(timespec="seconds")
     duration = get_audio_duration(output_path)
     duration_str = f"{int(duration // 60)}:{int(duration % 60):02d}" if duration else "?"
 
-    SCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-    meta_path = SCRIPTS_DIR / f"talk_{segment_type}_{timestamp}.json"
-    with open(meta_path, "w") as f:
-        json.dump({
-            "type": segment_type,
-            "show_id": show_id,
-            "show_name": show_name,
-            "host": host_id,
-            "topic": topic,
-            "script": script,
-            "word_count": word_count,
-            "duration_seconds": duration,
-            "voices": voices,
-            "generated_at": datetime.now().isoformat(),
-        }, f, indent=2)
+    append_script_index(SCRIPTS_DIR, {
+        "id": f"talk_{segment_type}_{timestamp}",
+        "type": segment_type,
+        "show_id": show_id,
+        "show_name": show_name,
+        "host": host_id,
+        "topic": topic,
+        "script": script,
+        "word_count": word_count,
+        "duration_seconds": duration,
+        "voices": voices,
+        "generated_at": finished.isoformat(),
+    })
 
     log(f"  Created: {output_path.name} ({duration_str})")
 
@@ -827,9 +915,9 @@ def generate_segment(
     append_show_log(show_id, segment_type, topic, summary)
 
     append_event({
-        "id": event_id("seg", str(output_path), datetime.now().isoformat(timespec="seconds")),
+        "id": event_id("seg", str(output_path), finished_at),
         "type": "segment_generated",
-        "time": datetime.now().isoformat(timespec="seconds"),
+        "time": finished_at,
         "show_id": show_id,
         "segment_type": segment_type,
         "topic": topic,
@@ -843,6 +931,138 @@ def generate_segment(
     return output_path
 
 
+def plan_segments(
+    show: Show,
+    count: int,
+    segment_type: str | None = None,
+    topic: str | None = None,
+    intent: dict | None = None,
+    exclude: set[str] | None = None,
+) -> list[tuple[str, str]]:
+    """Decide (segment_type, topic) for each segment before any script is written.
+
+    Topics picked here are added to `exclude` so callers planning several
+    slots of the same show can share one set.
+    """
+    intent = intent or {}
+    if segment_type:
+        segment_types = [segment_type] * count
+    elif intent.get("segment_type"):
+        segment_types = [str(intent["segment_type"])] * count
+    else:
+        segment_types = random.choices(show.segment_types, k=count)
+
+    chosen_topics = exclude if exclude is not None else set()
+    specs: list[tuple[str, str]] = []
+    for st in segment_types:
+        segment_topic = topic if topic is not None else intent.get("topic")
+        if segment_topic is None:
+            segment_topic = select_topic(show.topic_focus, st, show_id=show.show_id, exclude=chosen_topics)
+            chosen_topics.add(segment_topic)
+        specs.append((st, segment_topic))
+    return specs
+
+
+def submit_scripts(
+    pool: ThreadPoolExecutor,
+    show: Show,
+    specs: list[tuple[str, str]],
+    intent_context: str | None = None,
+    prewritten: list[str | None] | None = None,
+) -> list[Future]:
+    """Queue script generation for each planned segment on `pool`.
+
+    Segments with a script in `prewritten` (same order as specs) skip Claude.
+    """
+    futures: list[Future] = []
+    for i, (st, segment_topic) in enumerate(specs):
+        script = prewritten[i] if prewritten else None
+        if script:
+            done: Future = Future()
+            done.set_result((segment_topic, script))
+            futures.append(done)
+            continue
+        futures.append(pool.submit(
+            write_segment_script,
+            show_id=show.show_id,
+            show_name=show.name,
+            show_description=show.description,
+            host_id=show.host,
+            topic_focus=show.topic_focus,
+            segment_type=st,
+            voices=dict(show.voices),
+            topic=segment_topic,
+            intent_context=intent_context,
+        ))
+    return futures
+
+
+def batch_write_scripts(plans: list[tuple[str, str, Show, list[tuple[str, str]]]]) -> list[list[str | None]]:
+    """Write every planned script through one Message Batches job.
+
+    Returns one list per plan, aligned with its specs; None marks scripts the
+    batch didn't deliver (or that failed the word-count gate), which are then
+    written the usual way.
+    """
+    prompts = {
+        f"seg_{p}_{i}": build_generation_prompt(
+            host_id=show.host,
+            segment_type=st,
+            topic=segment_topic,
+            show_name=show.name,
+            show_description=show.description,
+            topic_focus=show.topic_focus,
+            show_id=show.show_id,
+            guest_voice=show.voices.get("guest"),
+        )
+        for p, (_, _, show, specs) in enumerate(plans)
+        for i, (st, segment_topic) in enumerate(specs)
+    }
+    max_tokens = {
+        f"seg_{p}_{i}": segment_max_tokens(st)
+        for p, (_, _, _, specs) in enumerate(plans)
+        for i, (st, _) in enumerate(specs)
+    }
+    scripts = run_claude_batch(prompts, max_tokens=max_tokens)
+    return [
+        [
+            script if (script := scripts.get(f"seg_{p}_{i}")) and meets_word_target(script, st) else None
+            for i, (st, _) in enumerate(specs)
+        ]
+        for p, (_, _, _, specs) in enumerate(plans)
+    ]
+
+
+def render_written(
+    show: Show,
+    slot: str,
+    specs: list[tuple[str, str]],
+    futures: list[Future],
+) -> int:
+    """Render scripts in planned order as they arrive; returns segments created."""
+    # TTS stays serial (one Kokoro server); render in submission order.
+    success = 0
+    for i, ((st, _), future) in enumerate(zip(specs, futures)):
+        written = future.result()
+        if not written:
+            continue
+        log(f"\n[{i+1}/{len(specs)}]")
+        segment_topic, script = written
+        result = render_segment(
+            show_id=show.show_id,
+            show_name=show.name,
+            host_id=show.host,
+            segment_type=st,
+            voices=dict(show.voices),
+            slot=slot,
+            topic=segment_topic,
+            script=script,
+        )
+        if result:
+            success += 1
+    return success
+
+
 def generate_for_show(
     show_id: str,
     schedule: StationSchedule,
@@ -866,38 +1086,13 @@ def generate_for_show(
     log(f"Generating {count} segments for: {show.name} [slot {slot}]")
     log(f"{'='*60}")
 
-    success = 0
-    for i in range(count):
-        if segment_type:
-            st = segment_type
-        elif intent.get("segment_type"):
-            st = str(intent["segment_type"])
-        else:
-            st = random.choice(show.segment_types)
+    # Decide every segment up front so script generation (network-bound
+    # Claude calls) can run ahead while earlier scripts are being rendered.
+    specs = plan_segments(show, count, segment_type=segment_type, topic=topic, intent=intent)
 
-        segment_topic = topic if topic is not None else intent.get("topic")
-
-        log(f"\n[{i+1}/{count}]")
-
-        result = generate_segment(
-            show_id=show_id,
-            show_name=show.name,
-            show_description=show.description,
-            host_id=show.host,
-            topic_focus=show.topic_focus,
-            segment_type=st,
-            voices=dict(show.voices),
-            slot=slot,
-            topic=segment_topic,
-            intent_context=intent_context,
-        )
-        if result:
-            success += 1
-
-        if i < count - 1:
-            time.sleep(2)
-
-    return success
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRIPT_WORKERS, count))) as pool:
+        futures = submit_scripts(pool, show, specs, intent_context=intent_context)
+        return render_written(show, slot, specs, futures)
 
 
 def slot_segment_count(show_id: str, slot: str) -> int:
@@ -913,17 +1108,22 @@ def stock_ahead(
     airings_ahead: int = 4,
     min_per_slot: int = 6,
     count_per_generation: int = 3,
+    batch: bool = False,
 ) -> dict[str, int]:
     """Walk the next N airings and top up any below threshold.
 
     Current airing first, then upcoming ones, in chronological order.
     Stops at the first slot that's already stocked — returns early so the
-    operator's run stays short.
+    operator's run stays short. With `batch`, scripts are first requested
+    through the Message Batches API; anything it misses is written directly.
     """
     airings = schedule.next_airings(count=airings_ahead)
     log(f"=== Stock-ahead: next {len(airings)} airings, min {min_per_slot} each ===")
 
-    results: dict[str, int] = {}
+    # Plan every short slot first, then write all their scripts through one
+    # pool so Claude calls for later slots overlap rendering of earlier ones.
+    plans: list[tuple[str, str, Show, list[tuple[str, str]]]] = []
+    topics_by_show: dict[str, set[str]] = {}
     for show_id, airing_start in airings:
         slot = slot_key(airing_start)
         have = slot_segment_count(show_id, slot)
@@ -934,8 +1134,24 @@ def stock_ahead(
             continue
         to_make = min(count_per_generation, short_by)
         log(f"  [gen] {label}: {have}/{min_per_slot} — generating {to_make}")
-        results[label] = generate_for_show(show_id, schedule, slot=slot, count=to_make)
-        time.sleep(3)
+        show = schedule.shows[show_id]
+        specs = plan_segments(show, to_make, exclude=topics_by_show.setdefault(show_id, set()))
+        plans.append((label, slot, show, specs))
+
+    prewritten = batch_write_scripts(plans) if batch and plans else [None] * len(plans)
+
+    results: dict[str, int] = {}
+    total_specs = sum(len(specs) for *_, specs in plans)
+    with ThreadPoolExecutor(max_workers=max(1, min(SCRIPT_WORKERS, total_specs))) as pool:
+        submitted = [
+            (label, slot, show, specs, submit_scripts(pool, show, specs, prewritten=written))
+            for (label, slot, show, specs), written in zip(plans, prewritten)
+        ]
+        for label, slot, show, specs, futures in submitted:
+            log(f"\n{'='*60}")
+            log(f"Generating {len(specs)} segments for: {show.name} [slot {slot}]")
+            log(f"{'='*60}")
+            results[label] = render_written(show, slot, specs, futures)
 
     total = sum(results.values())
     log(f"\n=== Stock-ahead complete: {total} new segments ===")
@@ -977,6 +1193,8 @@ def main():
     parser.add_argument("--stock-ahead", type=int, default=0, metavar="N",
                         help="Walk next N airings and top up each to --min")
     parser.add_argument("--all", action="store_true", help="Alias for --stock-ahead 4")
+    parser.add_argument("--batch", action="store_true",
+                        help="With --stock-ahead/--all: write scripts via the Message Batches API (needs ANTHROPIC_API_KEY)")
     parser.add_argument("--plan", action="store_true", help="Generate a planned show (intro, themed segments, outro)")
     parser.add_argument("--status", action="store_true", help="Show segment counts per upcoming slot")
     parser.add_argument("--list-types", action="store_true", help="List segment types")
@@ -1051,12 +1269,19 @@ def main():
         # All upcoming slots for this show are stocked — fall back to current airing
         return slot_key(schedule.airing_start())
 
+    # Fail before spending Claude calls on scripts that could never be
+    # rendered; on success the model loads while the first scripts are written.
+    if not warmup_kokoro():
+        log("Aborting: Kokoro TTS is not available")
+        return 1
+
     if args.plan:
         show_id = args.show or schedule.resolve().show_id
         generate_planned_show(show_id, schedule, slot=resolve_slot(show_id))
     elif args.all or args.stock_ahead:
         n = args.stock_ahead or 4
-        stock_ahead(schedule, airings_ahead=n, min_per_slot=args.min, count_per_generation=args.count)
+        stock_ahead(schedule, airings_ahead=n, min_per_slot=args.min, count_per_generation=args.count,
+                    batch=args.batch)
     elif args.show:
         generate_for_show(
             args.show, schedule,
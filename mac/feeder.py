@@ -15,6 +15,7 @@ import random
 import signal
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -47,11 +48,18 @@ if public_repo.parent.exists():
 ICECAST_STATUS_URL = os.environ.get("ICECAST_STATUS_URL", "http://localhost:8000/status-json.xsl")
 
 running = True
+_stop = threading.Event()  # set on shutdown; wakes the main loop's wait
+
+
+_log_stamp: tuple[int, str] = (-1, "")  # (epoch second, "HH:MM:SS") of the last line
 
 
 def log(msg: str):
-    ts = datetime.now().strftime("%H:%M:%S")
-    print(f"[{ts}] {msg}", flush=True)
+    global _log_stamp
+    second = int(time.time())
+    if second != _log_stamp[0]:
+        _log_stamp = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+    print(f"[{_log_stamp[1]}] {msg}", flush=True)
 
 
 def sighup_handler(signum, frame):
@@ -63,6 +71,7 @@ def signal_handler(signum, frame):
     global running
     log("Feeder shutting down...")
     running = False
+    _stop.set()
 
 
 def get_show():
@@ -463,7 +472,7 @@ def run():
                 write_playlist(playlist_entries)
                 signal_ezstream_reload()
 
-        time.sleep(5)
+        _stop.wait(5)
 
     # Clean up ezstream if we started it
     if ezstream_proc and ezstream_proc.poll() is None:
@@ -509,7 +518,6 @@ def start_ezstream() -> subprocess.Popen:
                 log(f"  [ezstream] {text}")
         pipe.close()
 
-    import threading
     threading.Thread(target=_log_ezstream, args=(proc.stderr,), daemon=True).start()
 
     time.sleep(2)
@@ -21,17 +21,32 @@ Available voices:
     British Male: bm_daniel, bm_fable, bm_george, bm_lewis
 """
 
+import json
 import os
+import socket
 import subprocess
+import time
 from pathlib import Path
 
 # Get the kokoro directory (where this file lives)
 KOKORO_DIR = Path(__file__).parent
 VENV_PYTHON = KOKORO_DIR / ".venv" / "bin" / "python"
+WORKER_SCRIPT = KOKORO_DIR / "worker.py"
 
 # Default voice - deep male for The Operator
 DEFAULT_VOICE = "am_michael"
 
+# Shared Kokoro server (worker.py --socket), started on first render and
+# reused by every generator process until it idles out
+SOCKET_PATH = Path(os.environ.get("WRIT_KOKORO_SOCKET", Path.home() / ".writ" / "kokoro.sock"))
+SERVER_START_TIMEOUT = 30
+# How long a request may wait for the server to pick it up. The server takes
+# one connection at a time, so this covers other processes' renders (a whole
+# talk script) and the first model load; render timeouts start after it.
+QUEUE_TIMEOUT = float(os.environ.get("WRIT_KOKORO_QUEUE_TIMEOUT", "3600"))
+
+_venv_ready = False
+
 
 def setup_venv():
     """Create and set up the kokoro venv if it doesn't exist."""
@@ -48,6 +63,116 @@ def setup_venv():
     return VENV_PYTHON.exists()
 
 
+def _ensure_venv() -> bool:
+    """Check (and if needed build) the venv once per process."""
+    global _venv_ready
+    if not _venv_ready:
+        _venv_ready = VENV_PYTHON.exists() or setup_venv()
+        if not _venv_ready:
+            print("Failed to set up Kokoro venv")
+    return _venv_ready
+
+
+def _connect() -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(SOCKET_PATH))
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def _start_server() -> subprocess.Popen | None:
+    """Launch the shared Kokoro server in the background."""
+    if not _ensure_venv():
+        return None
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # Left online so a fresh install downloads the model, and a voice pack
+    # not used before can still be fetched; the hub falls back to its cache
+    # when there is no network. Set HF_HUB_OFFLINE=1 yourself to pin it.
+    with open(SOCKET_PATH.with_suffix(".log"), "a") as log_file:
+        return subprocess.Popen(
+            [str(VENV_PYTHON), str(WORKER_SCRIPT), "--socket", str(SOCKET_PATH)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log_file,
+            cwd=str(KOKORO_DIR),
+            start_new_session=True,  # outlive this generator run
+        )
+
+
+def _ensure_server() -> socket.socket | None:
+    """Connect to the shared Kokoro server, starting it if nobody has."""
+    sock = _connect()
+    if sock is not None:
+        return sock
+    proc = _start_server()
+    if proc is None:
+        return None
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect()
+        if sock is not None:
+            return sock
+        if proc.poll() is not None:
+            # Exited without serving: it crashed, or lost the race to a
+            # server another process started - one last try decides which.
+            sock = _connect()
+            if sock is not None:
+                return sock
+            break
+        time.sleep(0.2)
+    print(f"Kokoro server did not come up (see {SOCKET_PATH.with_suffix('.log')})")
+    return None
+
+
+def _request(req: dict, timeout: float) -> dict | None:
+    """Send one request to the Kokoro server and wait for its reply line.
+
+    `timeout` covers the render itself; it starts once the server
+    acknowledges the request, not while it is queued behind other clients.
+    """
+    sock = _ensure_server()
+    if sock is None:
+        return None
+    with sock:
+        sock.settimeout(QUEUE_TIMEOUT)
+        try:
+            sock.sendall((json.dumps(req) + "\n").encode())
+            with sock.makefile("r") as rfile:
+                line = rfile.readline()
+                if line and json.loads(line).get("started"):
+                    sock.settimeout(timeout)
+                    line = rfile.readline()
+        except socket.timeout:
+            print("Kokoro timed out")
+            return None
+        except OSError as e:
+            print(f"TTS error: {e}")
+            return None
+    if not line:
+        print("Kokoro server closed the connection")
+        return None
+    return json.loads(line)
+
+
+def warmup() -> bool:
+    """Make sure the shared server is up, starting it if needed.
+
+    The generators call this (via helpers.warmup_kokoro) before submitting
+    any scripts, so a missing venv fails fast and the model can load while
+    the first scripts are still being written.
+    """
+    sock = _ensure_server()
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
 def render_speech(
     text: str,
     output_path: Path,
@@ -57,6 +182,10 @@ def render_speech(
     """
     Render text to speech using Kokoro TTS.
 
+    Requests go to a shared Kokoro server that keeps the pipeline loaded;
+    the first caller starts it and every generator process reuses it
+    instead of paying the import and model load again.
+
     Args:
         text: The text to speak
         output_path: Where to save the WAV file
@@ -66,72 +195,45 @@ def render_speech(
     Returns:
         True if successful, False otherwise
     """
-    if not VENV_PYTHON.exists():
-        if not setup_venv():
-            print("Failed to set up Kokoro venv")
-            return False
-
-    # Escape text for embedding in Python string
-    escaped_text = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
-
-    # Build the TTS script
-    tts_script = f'''
-import os
-os.environ["HF_HUB_OFFLINE"] = "1"
-os.environ["TRANSFORMERS_OFFLINE"] = "1"
-import warnings
-warnings.filterwarnings("ignore")
-
-from kokoro import KPipeline
-import soundfile as sf
-
-pipe = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
-
-text = "{escaped_text}"
-voice = "{voice}"
-speed = {speed}
-
-# Generate audio
-generator = pipe(text, voice=voice, speed=speed)
+    reply = _request(
+        {"text": text, "output": str(output_path), "voice": voice, "speed": speed},
+        timeout=300,  # 5 minutes max (Kokoro is fast; first call includes model load)
+    )
+    if reply is None:
+        return False
+    if reply.get("ok"):
+        return True
+    print(f"Kokoro error: {reply.get('error')}")
+    return False
 
-# Collect all audio segments
-audio_segments = []
-for _, _, audio in generator:
-    audio_segments.append(audio)
 
-# Concatenate if multiple segments
-import numpy as np
-if len(audio_segments) == 1:
-    full_audio = audio_segments[0]
-else:
-    full_audio = np.concatenate(audio_segments)
+def render_speech_batch(
+    items: list[tuple[str, Path]],
+    voice: str = DEFAULT_VOICE,
+    speed: float = 1.0,
+) -> list[bool]:
+    """
+    Render several (text, output_path) pairs in a single server round trip.
 
-# Save to file
-sf.write("{output_path}", full_audio, 24000)
-print("SUCCESS")
-'''
+    Returns:
+        One success flag per item, in order
+    """
+    if not items:
+        return []
+    batch = [
+        {"text": text, "output": str(path), "voice": voice, "speed": speed}
+        for text, path in items
+    ]
+    reply = _request({"batch": batch}, timeout=300 * len(batch))
+    if reply is None:
+        return [False] * len(items)
 
-    try:
-        env = {**os.environ, "HF_HUB_OFFLINE": "1", "TRANSFORMERS_OFFLINE": "1"}
-        result = subprocess.run(
-            [str(VENV_PYTHON), "-c", tts_script],
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minutes max (Kokoro is fast)
-            cwd=str(KOKORO_DIR),
-            env=env,
-        )
-        if "SUCCESS" in result.stdout:
-            return True
-        else:
-            print(f"Kokoro error: {result.stderr}")
-            return False
-    except subprocess.TimeoutExpired:
-        print("Kokoro timed out")
-        return False
-    except Exception as e:
-        print(f"TTS error: {e}")
-        return False
+    results = reply.get("results") or []
+    flags = [bool(r.get("ok")) for r in results]
+    for r in results:
+        if not r.get("ok"):
+            print(f"Kokoro error: {r.get('error')}")
+    return flags + [False] * (len(items) - len(flags))
 
 
 # List available voices
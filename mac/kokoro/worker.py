@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+WRIT-FM Kokoro TTS Worker
+
+Long-lived Kokoro server. Loads the pipeline once, then renders one request
+per JSON line and answers with one JSON line. Runs inside the kokoro venv;
+started by tts.py, never imported directly.
+
+Usage:
+    worker.py --socket PATH    shared server on a Unix socket; every generator
+                               process talks to the same loaded model, one
+                               connection at a time, and the server exits
+                               after WRIT_KOKORO_IDLE seconds without clients
+
+Protocol:
+    request:  {"text": "...", "output": "/path/to/out.wav", "voice": "am_michael", "speed": 1.0}
+    response: {"ok": true} or {"ok": false, "error": "..."}
+
+    batch:    {"batch": [request, ...]}
+    response: {"ok": <all ok>, "results": [response, ...]}
+
+    The server first answers each request with {"started": true} when it
+    picks it up, so clients can time the render separately from the time
+    spent queued behind other connections.
+"""
+
+import os
+
+# Thread pools are sized when torch loads, so cap them before the kokoro
+# import. Kokoro runs on CPU unless CUDA is present; an uncapped pool on a
+# busy machine oversubscribes the cores.
+def _thread_count() -> int:
+    """First usable thread count from the environment, else a small default."""
+    for var in ("WRIT_KOKORO_THREADS", "OMP_NUM_THREADS"):
+        try:
+            return max(1, int(os.environ.get(var, "")))
+        except ValueError:
+            continue  # unset, empty or not a number
+    return min(4, os.cpu_count() or 1)
+
+
+THREADS = _thread_count()
+# Overwrite rather than setdefault: THREADS already honours a valid value,
+# and a malformed one would otherwise reach OpenMP as is.
+os.environ["OMP_NUM_THREADS"] = str(THREADS)
+os.environ.setdefault("MKL_NUM_THREADS", str(THREADS))
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+import argparse
+import fcntl
+import json
+import socket
+import sys
+import warnings
+warnings.filterwarnings("ignore")
+
+import numpy as np
+import soundfile as sf
+import torch
+from kokoro import KPipeline
+
+torch.set_num_threads(THREADS)
+
+SAMPLE_RATE = 24000
+IDLE_TIMEOUT = float(os.environ.get("WRIT_KOKORO_IDLE", "900"))
+
+
+def render(pipe: KPipeline, req: dict) -> dict:
+    """Render a single request to its output path."""
+    generator = pipe(req["text"], voice=req["voice"], speed=float(req.get("speed", 1.0)))
+    # The pipeline is a lazy generator, so the mode has to cover the iteration.
+    with torch.inference_mode():
+        audio_segments = [audio for _, _, audio in generator]
+    if not audio_segments:
+        return {"ok": False, "error": "no audio generated"}
+
+    if len(audio_segments) == 1:
+        full_audio = audio_segments[0]
+    else:
+        full_audio = np.concatenate(audio_segments)
+
+    sf.write(req["output"], full_audio, SAMPLE_RATE, subtype="PCM_16")
+    return {"ok": True}
+
+
+def _safe_render(pipe: KPipeline, req: dict) -> dict:
+    try:
+        return render(pipe, req)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def handle(pipe: KPipeline, req: dict) -> dict:
+    """Render a single request or a batch of them in one round trip."""
+    if "batch" not in req:
+        return _safe_render(pipe, req)
+    # KPipeline has no padded multi-utterance pass; items render back to back
+    # so the batch costs one IPC round trip instead of one per item.
+    results = [_safe_render(pipe, item) for item in req["batch"]]
+    return {"ok": all(r["ok"] for r in results), "results": results}
+
+
+def serve(pipe: KPipeline, rfile, wfile) -> None:
+    """Answer JSON-line requests from one connection until it closes."""
+    for line in rfile:
+        if not line.strip():
+            continue
+        wfile.write('{"started": true}\n')
+        wfile.flush()
+        try:
+            reply = handle(pipe, json.loads(line))
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        wfile.write(json.dumps(reply) + "\n")
+        wfile.flush()
+
+
+def _socket_alive(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _unlink_if_ours(path: str, inode: int) -> None:
+    """Remove the socket file only if it is still the one this server bound."""
+    try:
+        if os.stat(path).st_ino == inode:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def serve_socket(path: str, idle_timeout: float) -> int:
+    """Serve connections on a Unix socket until idle for idle_timeout seconds."""
+    # Servers started at the same moment take turns on a sidecar lock, so one
+    # can't unlink a socket another has just bound.
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if _socket_alive(path):
+            return 0  # another server already owns the socket
+
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket from a server that died
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(16)
+        inode = os.stat(path).st_ino
+    try:
+        # Bind before loading so clients can queue up while the model loads.
+        pipe = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
+        server.settimeout(idle_timeout)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            conn.settimeout(idle_timeout)
+            with conn, conn.makefile("r") as rfile, conn.makefile("w") as wfile:
+                try:
+                    serve(pipe, rfile, wfile)
+                except OSError:
+                    pass  # client went away or stalled; drop it
+    finally:
+        server.close()
+        # A successor may already have replaced our socket; leave its file be.
+        _unlink_if_ours(path, inode)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--socket", required=True, help="Unix socket to serve on")
+    args = parser.parse_args()
+
+    # Anything the libraries print goes to stderr, which tts.py logs.
+    sys.stdout = sys.stderr
+    return serve_socket(args.socket, IDLE_TIMEOUT)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,11 +15,21 @@ unset CLAUDECODE
 
 ts() { date +%H:%M; }
 
+# mtime:inode:size of the queue. Writers replace the file atomically, so any
+# change gives a new inode even within the same second.
+queue_sig() { stat -c '%Y:%i:%s' "$1" 2>/dev/null || stat -f '%m:%i:%z' "$1" 2>/dev/null; }
+EMPTY_SIG=""  # signature of the last version found to have nothing unread
+
 echo "[listener-daemon $(ts)] Starting. Polling every ${POLL_INTERVAL}s"
 
 while true; do
-    # Quick check: any unread messages?
-    if [ -f "$MESSAGES_FILE" ]; then
+    # Quick check: any unread messages? Skip the parse if the file is
+    # unchanged since it was last seen with nothing unread.
+    SIG=""
+    [ -f "$MESSAGES_FILE" ] && SIG=$(queue_sig "$MESSAGES_FILE")
+    if [ -n "$SIG" ] && [ "$SIG" = "$EMPTY_SIG" ]; then
+        UNREAD=0
+    elif [ -f "$MESSAGES_FILE" ]; then
         UNREAD=$(python3 -c "
 import json, sys
 try:
@@ -28,6 +38,7 @@ try:
     print(len(unread))
 except: print(0)
 " 2>/dev/null)
+        [ "$UNREAD" = "0" ] && EMPTY_SIG="$SIG"
     else
         UNREAD=0
     fi
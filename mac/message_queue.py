@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+WRIT-FM Listener Message Queue
+
+The queue is a small JSON list at ~/.writ/messages.json. The API server
+appends to it, and the listener response generator marks entries read. These
+run in different processes, so every read-modify-write goes through
+update_messages(). It holds an flock on a sidecar lock file and swaps the
+new JSON in with one rename, so plain readers (jq, listener_daemon.sh, the
+ledger) never see a half-written file.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+MESSAGES_FILE = Path.home() / ".writ" / "messages.json"
+LOCK_FILE = MESSAGES_FILE.with_name(".messages.lock")
+
+
+def load_messages(path: Path = MESSAGES_FILE) -> list[dict]:
+    """Read the queue; a missing or unreadable file is an empty queue."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return []
+
+
+@contextmanager
+def update_messages(path: Path = MESSAGES_FILE) -> Iterator[list[dict]]:
+    """Lock the queue and yield its list; changes are written back on exit."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(LOCK_FILE.name), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        messages = load_messages(path)
+        before = json.dumps(messages)
+        yield messages
+        if json.dumps(messages) == before:
+            return  # nothing changed; skip the rewrite
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(messages, indent=2))
+        os.replace(tmp, path)